@@ -1,6 +1,12 @@
 import os
 import json
-import scadnano as sc
+import argparse
+from trace_store import TraceStore, resolve_db_path
+from design_engine import design_id_from_path
+from sc_reader import load_design_features
+
+# Strand properties that go into the fine-tuning prompt
+DATASET_FIELDS = ["helix_index", "strand_name", "strand_length", "direction"]
 
 def build_dataset_from_scadnano_files(folder_path):
     dataset = []
@@ -10,25 +16,15 @@ def build_dataset_from_scadnano_files(folder_path):
         if filename.endswith(".sc"):  # Process only .sc files
             file_path = os.path.join(folder_path, filename)
             
-            # Read files
+            # Read files (only the strand fields we need, without building a full sc.Design)
             try:
-                design = sc.Design.from_scadnano_file(file_path)
+                _, design_data = load_design_features(file_path, DATASET_FIELDS)
             except Exception as e:
                 print(f"Error reading {filename}: {e}")
                 continue  
 
-            # Extract relevant information
-            design_data = []
-            for strand in design.strands:
-                design_data.append({
-                    "helix_index": strand.domains[0].helix,  
-                    "strand_name": strand.name if hasattr(strand, 'name') else None,
-                    "strand_length": sum(domain.end - domain.start for domain in strand.domains),
-                    "direction": 'forward' if strand.domains[0].forward else 'reverse'
-                })
-
             # Create the "prompt" and "target" for fine-tuning
-            prompt = f"Generate DNA design with {len(design.strands)} strands, each with properties: {design_data}"
+            prompt = f"Generate DNA design with {len(design_data)} strands, each with properties: {design_data}"
             target = json.dumps({
                 "design_data": design_data
             })
@@ -48,6 +44,152 @@ def build_dataset_from_scadnano_files(folder_path):
 
     print("📁 Data appended to react_dna_dataset.jsonl")
 
+# --- Columnar feature export (Parquet) ---
+
+STRAND_COLUMNS = ["design_file", "design_id", "prompt_hash", "strand_index", "helix_index", "strand_name", "strand_length",
+                  "direction", "domain_count", "loopout_count", "crossover_count"]
+DESIGN_COLUMNS = ["design_file", "design_id", "prompt_hash", "outcome", "helix_count", "strand_count", "total_strand_length",
+                  "domain_count", "loopout_count", "crossover_count"]
+
+
+def _strand_schema(pa):
+    return pa.schema([
+        ("design_file", pa.string()),
+        ("design_id", pa.string()),
+        ("prompt_hash", pa.string()),
+        ("strand_index", pa.int32()),
+        ("helix_index", pa.int32()),
+        ("strand_name", pa.string()),
+        ("strand_length", pa.int32()),
+        ("direction", pa.string()),
+        ("domain_count", pa.int16()),
+        ("loopout_count", pa.int16()),
+        ("crossover_count", pa.int16()),
+    ])
+
+
+def _design_schema(pa):
+    return pa.schema([
+        ("design_file", pa.string()),
+        ("design_id", pa.string()),
+        ("prompt_hash", pa.string()),
+        ("outcome", pa.string()),
+        ("helix_count", pa.int32()),
+        ("strand_count", pa.int32()),
+        ("total_strand_length", pa.int64()),
+        ("domain_count", pa.int32()),
+        ("loopout_count", pa.int32()),
+        ("crossover_count", pa.int32()),
+    ])
+
+
+# Design files whose traces are looked up with one query (kept under SQLite's parameter limit)
+TRACE_LOOKUP_BATCH = 500
+
+
+# Write per-strand and per-design features to <output_dir>/strands.parquet and designs.parquet.
+# Rows are flushed every `row_group_size` rows and traces are looked up a batch of files at a time,
+# so memory stays bounded however many designs there are. prompt_hash and outcome come from the
+# ReAct trace store: trace_db, else $REACT_TRACE_DB, else the default, as for the agents.
+def export_design_features(folder_path, output_dir="features", row_group_size=65536, trace_db=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(output_dir, exist_ok=True)
+    trace_db = resolve_db_path(trace_db)
+    store = TraceStore(trace_db) if os.path.exists(trace_db) else None
+    if store is None:
+        print(f"⚠️ No trace database at {trace_db}: prompt_hash and outcome will be empty")
+    strand_schema = _strand_schema(pa)
+    design_schema = _design_schema(pa)
+    strand_rows = {name: [] for name in STRAND_COLUMNS}
+    design_rows = {name: [] for name in DESIGN_COLUMNS}
+
+    def flush(writer, rows, schema):
+        if rows[schema.names[0]]:
+            writer.write_table(pa.Table.from_pydict(rows, schema=schema), row_group_size=row_group_size)
+            for column in rows.values():
+                column.clear()
+
+    strands_path = os.path.join(output_dir, "strands.parquet")
+    designs_path = os.path.join(output_dir, "designs.parquet")
+    filenames = sorted(filename for filename in os.listdir(folder_path) if filename.endswith(".sc"))
+    num_designs = 0
+    num_traced = 0
+    with pq.ParquetWriter(strands_path, strand_schema) as strand_writer, \
+            pq.ParquetWriter(designs_path, design_schema) as design_writer:
+        for batch_start in range(0, len(filenames), TRACE_LOOKUP_BATCH):
+            batch = filenames[batch_start:batch_start + TRACE_LOOKUP_BATCH]
+            design_ids = [design_id_from_path(filename) for filename in batch]
+            outcomes = store.design_outcomes(design_ids) if store else {}
+
+            for filename, design_id in zip(batch, design_ids):
+                try:
+                    helix_count, strands = load_design_features(os.path.join(folder_path, filename))
+                except Exception as e:
+                    print(f"Error reading {filename}: {e}")
+                    continue
+
+                p_hash, outcome = outcomes.get(design_id, (None, None))
+                totals = {"strand_count": 0, "total_strand_length": 0, "domain_count": 0,
+                          "loopout_count": 0, "crossover_count": 0}
+                for strand_index, features in enumerate(strands):
+                    strand_rows["design_file"].append(filename)
+                    strand_rows["design_id"].append(design_id)
+                    strand_rows["prompt_hash"].append(p_hash)
+                    strand_rows["strand_index"].append(strand_index)
+                    for name, value in features.items():
+                        strand_rows[name].append(value)
+                    totals["strand_count"] += 1
+                    totals["total_strand_length"] += features["strand_length"]
+                    totals["domain_count"] += features["domain_count"]
+                    totals["loopout_count"] += features["loopout_count"]
+                    totals["crossover_count"] += features["crossover_count"]
+                    if len(strand_rows["design_file"]) >= row_group_size:
+                        flush(strand_writer, strand_rows, strand_schema)
+
+                design_rows["design_file"].append(filename)
+                design_rows["design_id"].append(design_id)
+                design_rows["prompt_hash"].append(p_hash)
+                design_rows["outcome"].append(outcome)
+                design_rows["helix_count"].append(helix_count)
+                for name, value in totals.items():
+                    design_rows[name].append(value)
+                if len(design_rows["design_file"]) >= row_group_size:
+                    flush(design_writer, design_rows, design_schema)
+                num_designs += 1
+                num_traced += design_id in outcomes
+
+        flush(strand_writer, strand_rows, strand_schema)
+        flush(design_writer, design_rows, design_schema)
+
+    if store is not None:
+        store.close()
+        if num_designs and not num_traced:
+            print(f"⚠️ None of the designs have a trace in {trace_db}: prompt_hash and outcome are empty")
+    print(f"📁 Features of {num_designs} designs written to {strands_path} and {designs_path}")
+    return strands_path, designs_path
+
+
+# Read a features file back; `filters` (e.g. [("helix_count", ">=", 10)]) are pushed down to the
+# Parquet reader so row groups whose statistics rule them out are never decoded.
+def read_design_features(path, columns=None, filters=None):
+    import pyarrow.parquet as pq
+    return pq.read_table(path, columns=columns, filters=filters)
+
+
 if __name__ == "__main__":
-    folder_path = "designs" 
-    build_dataset_from_scadnano_files(folder_path)
+    parser = argparse.ArgumentParser(description="Build datasets from scadnano designs.")
+    parser.add_argument("folder_path", nargs="?", default="designs")
+    parser.add_argument("--parquet", action="store_true", help="export columnar strand/design features instead of JSONL")
+    parser.add_argument("--output-dir", default="features")
+    parser.add_argument("--row-group-size", type=int, default=65536)
+    parser.add_argument("--trace-db", default=None,
+                        help="ReAct trace database to join on (default: $REACT_TRACE_DB, else designs/react_traces.db)")
+    args = parser.parse_args()
+
+    if args.parquet:
+        export_design_features(args.folder_path, args.output_dir, row_group_size=args.row_group_size,
+                               trace_db=args.trace_db)
+    else:
+        build_dataset_from_scadnano_files(args.folder_path)
@@ -0,0 +1,268 @@
+import os
+import re
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from datetime import datetime
+from trace_store import get_default_store
+from dna_parsers import ModelCallError
+
+# What react_design hands back: the trace, where the design went (None if it was not built) and the parsed spec
+DesignResult = namedtuple("DesignResult", ["design_id", "steps", "output_path", "outcome", "spec"])
+
+
+# Logging (stage/outcome let the trace store index failures)
+def log_step(steps, thought, action, observation, stage=None, outcome="ok"):
+    steps.append({
+        "thought": thought,
+        "action": action,
+        "observation": observation,
+        "stage": stage,
+        "outcome": outcome
+    })
+
+
+# ---------------------------------------------------------------------------
+# Output sinks: where a finished design goes
+# ---------------------------------------------------------------------------
+
+class OutputSink(ABC):
+    # Store the design and return where it went
+    @abstractmethod
+    def write(self, design, spec, design_id=None):
+        ...
+
+
+class ScadnanoFileSink(OutputSink):
+    def __init__(self, directory='designs'):
+        self.directory = directory
+
+    # The design id in the file name keeps files written in the same second apart and ties
+    # each file to its trace (see design_id_from_path)
+    def write(self, design, spec, design_id=None):
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f'dna_design_{spec.helices}x{spec.length}_{timestamp}_{design_id or uuid.uuid4().hex}.sc'
+        design.write_scadnano_file(directory=self.directory, filename=filename)
+        return f"{self.directory}/{filename}"
+
+
+_DESIGN_FILE_ID = re.compile(r'_([0-9a-f]{32})\.sc$')
+
+
+# Design id of a file written by ScadnanoFileSink (None for files named otherwise)
+def design_id_from_path(path):
+    match = _DESIGN_FILE_ID.search(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+# Keeps the design in memory only (benchmarks, dry runs)
+class NullSink(OutputSink):
+    def __init__(self):
+        self.last_design = None
+
+    def write(self, design, spec, design_id=None):
+        self.last_design = design
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Design engine
+# ---------------------------------------------------------------------------
+
+class DesignEngine:
+    def __init__(self, parser, sink=None, store=None, trace=True, verbose=False):
+        self.parser = parser
+        self.sink = sink or ScadnanoFileSink()
+        self.trace = trace
+        self.verbose = verbose
+        self._store = store
+
+    @property
+    def store(self):
+        # Opened on first design so constructing an engine stays cheap; every engine shares the one default store
+        if self._store is None:
+            self._store = get_default_store()
+        return self._store
+
+    def log(self, steps, thought, action, observation, stage=None, outcome="ok"):
+        log_step(steps, thought, action, observation, stage=stage, outcome=outcome)
+        if self.verbose:
+            print(f"Thought: {thought}" if outcome == "ok" else f"Error: {thought}: {observation}")
+
+    # ReAct function: parse the prompt, build the design and hand it to the sink
+    def react_design(self, prompt: str):
+        steps = []
+        design_id = self.store.start_design(prompt, agent=self.parser.name) if self.trace else None
+        spec = None
+        output = None
+        timings = {"parse_seconds": None, "build_seconds": None}
+        try:
+            t0 = time.perf_counter()
+            spec = self.parse(prompt, steps)
+            timings["parse_seconds"] = time.perf_counter() - t0
+            if spec is not None:
+                import scadnano as sc  # first-use import, kept out of the build time
+                t0 = time.perf_counter()
+                design = self.build(spec, steps, sc)
+                timings["build_seconds"] = time.perf_counter() - t0  # scadnano work only, not the sink's I/O
+                output = self.sink.write(design, spec, design_id)
+                self.log(steps, "Save design", f"Save to {output}", "Design saved", stage="save")
+        except Exception as e:
+            self.log(steps, "Design failed", "Abort", f"Error: {e}", stage="design", outcome="failed")
+            self._finish(design_id, steps, "failed", spec, output, timings)
+            raise
+
+        if spec is None:
+            outcome = "failed"
+        elif any(step["outcome"] == "failed" for step in steps):
+            outcome = "partial"
+        else:
+            outcome = "ok"
+        self._finish(design_id, steps, outcome, spec, output, timings)
+        return DesignResult(design_id, steps, output, outcome, spec)
+
+    def _finish(self, design_id, steps, outcome, spec, output, timings):
+        if not self.trace:
+            return
+        self.store.log_steps(design_id, steps)
+        self.store.finish_design(design_id, outcome,
+                                 helices=spec.helices if spec else None,
+                                 length=spec.length if spec else None,
+                                 output_path=output, **timings)
+
+    # === Step 1: Extract parameters from prompt ===
+    def parse(self, prompt, steps):
+        try:
+            spec, model_output = self.parser.parse_with_output(prompt)
+        except ModelCallError as e:
+            self.log(steps, "Extract parameters", f"Query model ({self.parser.name})", str(e),
+                     stage="parse", outcome="failed")
+            return None
+        except ValueError as e:
+            self.log_model_output(steps, getattr(e, "model_output", None))
+            self.log(steps, "Extract parameters", f"Parse prompt ({self.parser.name})", str(e),
+                     stage="parse", outcome="failed")
+            return None
+
+        self.log_model_output(steps, model_output)
+        self.log(steps, f"Extracted {spec.helices} helices, length {spec.length}, loops {list(spec.loops)}, "
+                        f"sticky ends {list(spec.sticky_ends)}, crossovers {list(spec.crossovers)}",
+                 f"Parse prompt ({self.parser.name})", "Parameters extracted", stage="parse")
+        return spec
+
+    def log_model_output(self, steps, model_output):
+        if model_output is not None:
+            self.log(steps, f"Model output generated:\n{model_output}", "Generate model output", "Model output received",
+                     stage="parse")
+
+    def build(self, spec, steps, sc):
+        helices, total_length = spec.helices, spec.length
+        offset = total_length // 2  # middle of the strand
+
+        # === Step 2: Initialize design ===
+        helices_list = [sc.Helix(max_offset=total_length) for _ in range(helices)]
+        design = sc.Design(helices=helices_list, strands=[], grid=sc.Grid.square)
+        design.set_helices_view_order(list(range(helices)))
+        self.log(steps, "Initialize design", "Create helices and set view order", "Design initialized", stage="init")
+
+        # === Step 3: Add strands and nick them ===
+        for i in range(helices):
+            strand = sc.Strand([sc.Domain(helix=i, start=0, end=total_length, forward=True)])
+            design.add_strand(strand)
+            design.add_nick(helix=i, offset=offset, forward=True)
+            self.log(steps, f"Add strand to helix {i}", "Add strand and nick", "Strand added and nicked", stage="strand")
+
+        # === Step 4: Add loops if present ===
+        for helix_start, helix_end, loop_length in spec.loops:
+            self.add_loop(design, helix_start, helix_end, loop_length, steps)
+
+        # === Step 5: Add crossovers ===
+        for helix1, helix2 in spec.crossovers:
+            self.add_crossover(design, sc, helix1, helix2, offset, total_length, steps)
+
+        # === Step 6: Add sticky ends ===
+        for helix1, helix2 in spec.sticky_ends:
+            self.add_sticky_ends(design, sc, helix1, helix2, total_length, steps)
+
+        return design
+
+    def add_loop(self, design, helix_start, helix_end, loop_length, steps):
+        thought = f"Add loop between helix {helix_start} and {helix_end}"
+        try:
+            design.add_loopout(helix_start - 1, helix_end - 1, loop_length)  # 1-based to 0-based
+            self.log(steps, thought, "Add loop", f"Loop of {loop_length} bases added", stage="loop")
+            return
+        except Exception as e:
+            self.log(steps, thought, "Add loop", f"Error: {e}", stage="loop", outcome="retry")
+
+        # Re-evaluate loop placement: try swapping helix_start and helix_end
+        try:
+            design.add_loopout(helix_end - 1, helix_start - 1, loop_length)
+            self.log(steps, f"Add loop after swapping helices {helix_end} and {helix_start}", "Add loop",
+                     f"Loop of {loop_length} bases added", stage="loop")
+        except Exception as e:
+            self.log(steps, f"Skip loop between helix {helix_start} and {helix_end}", "Add loop", f"Error: {e}",
+                     stage="loop", outcome="failed")
+
+    def add_crossover(self, design, sc, helix1, helix2, offset, total_length, steps):
+        thought = f"Add crossover between helix {helix1} and {helix2}"
+        try:
+            # Ensure strands are present at the correct offset before adding crossovers
+            strand1_exists = any(any(domain.helix == helix1 - 1 and domain.start <= offset < domain.end for domain in strand.domains) for strand in design.strands)
+            strand2_exists = any(any(domain.helix == helix2 - 1 and domain.start <= offset < domain.end for domain in strand.domains) for strand in design.strands)
+
+            if strand1_exists and strand2_exists:
+                design.add_full_crossover(helix=helix1 - 1, helix2=helix2 - 1, offset=offset, forward=True)
+                self.log(steps, thought, "Add crossover", "Crossover added", stage="crossover")
+                return
+            self.log(steps, thought, "Add crossover", "Strands not found at the correct offsets",
+                     stage="crossover", outcome="failed")
+        except Exception as e:
+            self.log(steps, thought, "Add crossover", f"Error: {e}", stage="crossover", outcome="failed")
+            return
+
+        # Re-evaluate crossover placement: link the helices with 4-base sticky ends instead
+        try:
+            self.add_strands(design, [
+                sc.Strand([sc.Domain(helix=helix1 - 1, start=total_length - 4, end=total_length, forward=True)]),
+                sc.Strand([sc.Domain(helix=helix2 - 1, start=0, end=4, forward=False)]),
+            ])
+            self.log(steps, f"Link helix {helix1} and {helix2} with sticky ends instead", "Add sticky ends",
+                     "Sticky ends with 4 base pairs added", stage="crossover")
+        except Exception as e:
+            self.log(steps, f"Skip sticky ends between helix {helix1} and {helix2}", "Add sticky ends", f"Error: {e}",
+                     stage="crossover", outcome="failed")
+
+    # Add the strands together or not at all.
+    # scadnano's add_strand adds the strand before it raises on an overlap, so a failed attempt
+    # takes out whatever it added, leaving the design as it was for the next attempt.
+    @staticmethod
+    def add_strands(design, strands):
+        added = []
+        try:
+            for strand in strands:
+                added.append(strand)
+                design.add_strand(strand)
+        except Exception:
+            for strand in added:
+                if any(existing is strand for existing in design.strands):
+                    design.remove_strand(strand)
+            raise
+
+    def add_sticky_ends(self, design, sc, helix1, helix2, total_length, steps):
+        thought = f"Add sticky ends between helix {helix1} and {helix2}"
+        for length in range(5, 9):  # start with 5 nt, go up to 8 nt
+            try:
+                # Sticky ends on opposing directions
+                self.add_strands(design, [
+                    sc.Strand([sc.Domain(helix=helix1 - 1, start=total_length - length, end=total_length, forward=True)]),
+                    sc.Strand([sc.Domain(helix=helix2 - 1, start=0, end=length, forward=False)]),
+                ])
+                self.log(steps, thought, "Add sticky ends", f"Sticky ends of {length} nt added", stage="sticky_end")
+                return
+            except Exception:
+                continue  # try with a longer sticky end
+        self.log(steps, thought, "Add sticky ends", "Failed even after length adjustment",
+                 stage="sticky_end", outcome="failed")
@@ -0,0 +1,287 @@
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from functools import lru_cache
+
+# What every parser backend hands to the design engine.
+# loops: (helix_start, helix_end, loop_length); sticky_ends and crossovers: (helix1, helix2), 1-based helices
+DesignSpec = namedtuple("DesignSpec", ["helices", "length", "loops", "sticky_ends", "crossovers"])
+
+
+# ---------------------------------------------------------------------------
+# Regex parser (plain user prompts)
+# ---------------------------------------------------------------------------
+
+# Parse the prompt to extract values
+def parse_prompt(prompt):
+
+    helices = int(re.search(r'(\d+)\s*helices?', prompt).group(1)) # if 'helices' in prompt else 6
+    length_match = re.search(r'(\d+)\s*(?:bases|bp)', prompt)
+    length = int(length_match.group(1)) # if length_match else 32
+
+    # Loop instructions: (helix_start, helix_end, loop_length)
+    loop_instructions = []
+    loop_matches = re.findall(r'helix\s*(\d+)\s*and\s*(\d+)\s*have\s*a\s*loop\s*of\s*(\d+)\s*base\s*pairs', prompt.lower())
+    for match in loop_matches:
+        loop_instructions.append((int(match[0]), int(match[1]), int(match[2])))  # Store as (helix_start, helix_end, loop_length)
+
+    # Sticky end instructions: (helix1, helix2)
+    sticky_end_instructions = []
+    sticky_matches = re.findall(r'helix\s*(\d+)\s*has\s*a\s*sticky\s*end\s*linking\s*with\s*helix\s*(\d+)', prompt.lower())
+    for match in sticky_matches:
+        sticky_end_instructions.append((int(match[0]), int(match[1])))  # Store as (helix1, helix2)
+
+    # Crossover instructions: (helix1, helix2)
+    crossover_instructions = []
+    crossover_matches = re.findall(r'crossovers?\s*between\s*helix\s*(\d+)\s*and\s*helix\s*(\d+)', prompt.lower())
+    for match in crossover_matches:
+        crossover_instructions.append((int(match[0]), int(match[1])))  # Store as (helix1, helix2)
+
+    return helices, length, loop_instructions, sticky_end_instructions, crossover_instructions
+
+
+# ---------------------------------------------------------------------------
+# Local model output (GPT-2 via transformers)
+# ---------------------------------------------------------------------------
+
+# Load model and tokenizer on first use (transformers is slow to import)
+@lru_cache(maxsize=None)
+def get_generator():
+    from transformers import GPT2Tokenizer, GPT2LMHeadModel, pipeline
+    tokenizer = GPT2Tokenizer.from_pretrained('gpt2')  # or 'distilgpt2' for a smaller model
+    model = GPT2LMHeadModel.from_pretrained('gpt2')  # or 'distilgpt2' for a smaller model
+    return pipeline("text-generation", model=model, tokenizer=tokenizer)
+
+
+def format_local_prompt(prompt: str):
+    return (
+        f'Given this DNA design description: "{prompt}".\n'
+        f'Extract the key parameters by reasoning step-by-step and return them in this format:\n'
+        f'1. Number of helices: <int>\n'
+        f'2. Total length: <int>\n'
+        f'3. Loops: <list of loops, each defined as [helix_start, helix_end, loop_length]>\n'
+        f'4. Sticky ends: <list of sticky ends, each defined as [helix1, helix2]>\n'
+        f'5. Crossovers: <list of crossovers, each defined as [helix1, helix2]>\n'
+        f'Answer in a numbered list format only, no explanations.'
+    )
+
+
+def generate_local(prompt: str):
+    model_output = get_generator()(format_local_prompt(prompt), max_length=500, truncation=True)[0]["generated_text"]
+    return model_output.strip()
+
+
+# Extract parameters from the model output
+def extract_parameters(model_output):
+    # Number of helices
+    helices_match = re.search(r"(\d+) helices", model_output)
+    helices = int(helices_match.group(1)) if helices_match else None
+
+    # Total length: (base pairs per helix * number of helices)
+    length_match = re.search(r"each (\d+) base pairs", model_output)
+    base_pair_length = int(length_match.group(1)) if length_match else None
+    total_length = helices * base_pair_length if helices and base_pair_length else None
+
+    # Loops
+    loops = []
+    loop_matches = re.findall(r"helixes (\d+) and (\d+) loop with (\d+) base pairs", model_output)
+    for match in loop_matches:
+        loops.append([int(match[0]), int(match[1]), int(match[2])])
+
+    # Sticky ends
+    sticky_ends = []
+    sticky_end_matches = re.findall(r"Helix (\d+) should have a sticky end that connects to helix (\d+)", model_output)
+    for match in sticky_end_matches:
+        sticky_ends.append([int(match[0]), int(match[1])])
+
+    # Crossovers
+    crossovers = []
+    crossover_matches = re.findall(r"crossovers? between helices (\d+) and (\d+)", model_output)
+    for match in crossover_matches:
+        crossovers.append([int(match[0]), int(match[1])])
+
+    return helices, total_length, loops, sticky_ends, crossovers
+
+
+# ---------------------------------------------------------------------------
+# Remote model output (Hugging Face inference API)
+# ---------------------------------------------------------------------------
+
+MODEL_NAME = "HuggingFaceH4/zephyr-7b-beta"
+
+
+# The model call itself failed (HTTP error, API error reply, non-JSON body): there is no
+# model text to parse. Not a ValueError, so it is never mistaken for an unparseable answer.
+class ModelCallError(RuntimeError):
+    pass
+
+
+# JSON reply of the API. {"error": ...} replies are returned (the API sends one with a 503 while the
+# model loads, and the caller retries); anything else that isn't a successful JSON reply is a ModelCallError.
+def _post_json(requests, url, headers, payload):
+    try:
+        response = requests.post(url, headers=headers, json=payload)
+        result = response.json()
+        if not (isinstance(result, dict) and result.get("error")):
+            response.raise_for_status()
+        return result
+    except (requests.RequestException, ValueError) as e:
+        raise ModelCallError(f"Model API call failed: {e}") from e
+
+
+def query_remote_model(prompt: str):
+    import requests  # only needed when we actually call the API
+
+    url = f"https://api-inference.huggingface.co/models/{MODEL_NAME}"
+
+    headers = {
+        "Authorization": f"Bearer ",
+        "Content-Type": "application/json",
+    }
+
+    payload = {
+        "inputs": f"Extract the following details from this DNA design prompt: {prompt}. Provide the output in this format: 'Helices: <number>, Total length: <number>, Loops: [(<helix1>, <helix2>, <length>)], Sticky ends: [(<helix1>, <helix2>)], Crossovers: [(<helix1>, <helix2>)]'.",
+        "parameters": {
+            "max_new_tokens": 300,
+            "temperature": 0.2
+        }
+    }
+
+    result = _post_json(requests, url, headers, payload)
+
+    # Handle model loading or errors
+    if isinstance(result, dict) and result.get("error"):
+        print(f"Model loading... waiting 5 seconds. Error: {result['error']}")
+        time.sleep(5)
+        result = _post_json(requests, url, headers, payload)
+
+    # Check the result
+    if isinstance(result, list) and result and "generated_text" in result[0]:
+        return result[0]['generated_text'].strip()
+    raise ModelCallError(f"Unexpected API response: {result}")
+
+
+def parse_structured_data(parsed_data: str):
+
+    helices = None
+    length = None
+    loop_instructions = []
+    sticky_end_instructions = []
+    crossover_instructions = []
+
+    # Extract the number of helices
+    helices_match = re.search(r'Helices:\s*(\d+)', parsed_data)
+    if helices_match:
+        helices = int(helices_match.group(1))
+    else:
+        raise ValueError("The LLM response did not provide the number of helices.")
+
+    # Extract the total base length
+    length_match = re.search(r'Total length:\s*(\d+)', parsed_data)
+    if length_match:
+        length = int(length_match.group(1))
+    else:
+        raise ValueError("The LLM response did not provide the total base length.")
+
+    # Extract loop instructions
+    loop_matches = re.findall(r'\((\d+),\s*(\d+),\s*(\d+)\)', parsed_data)
+    for match in loop_matches:
+        loop_instructions.append((int(match[0]), int(match[1]), int(match[2])))
+
+    # Extract sticky end instructions
+    sticky_matches = re.findall(r'\((\d+),\s*(\d+)\)', parsed_data)
+    for match in sticky_matches:
+        sticky_end_instructions.append((int(match[0]), int(match[1])))
+
+    # Extract crossover instructions
+    crossover_matches = re.findall(r'\((\d+),\s*(\d+)\)', parsed_data)
+    for match in crossover_matches:
+        crossover_instructions.append((int(match[0]), int(match[1])))
+
+    return helices, length, loop_instructions, sticky_end_instructions, crossover_instructions
+
+
+# ---------------------------------------------------------------------------
+# Parser backends: what the design engine talks to
+# ---------------------------------------------------------------------------
+
+# Raised when a model answered but its text could not be parsed; carries the text for the trace
+class ModelOutputError(ValueError):
+    def __init__(self, message, model_output):
+        super().__init__(message)
+        self.model_output = model_output
+
+
+# A backend turns a user prompt into a DesignSpec, or raises ValueError if it can't
+class ParserBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def parse(self, prompt: str):
+        ...
+
+    # (spec, raw model text); the text is None for backends that don't ask a model
+    def parse_with_output(self, prompt: str):
+        return self.parse(prompt), None
+
+
+class RegexParser(ParserBackend):
+    name = "regex"
+
+    def parse(self, prompt: str):
+        try:
+            return DesignSpec(*parse_prompt(prompt))
+        except AttributeError:
+            # re.search found nothing for helices or length
+            raise ValueError("The prompt did not provide the number of helices and their length.")
+
+
+# Backends that ask a model first and then parse its text.
+# `complete` maps prompt -> model text; swap it out to replay recorded responses.
+# The text is handed back with each result rather than kept on the parser, so one parser
+# can serve several designs at once.
+class ModelParser(ParserBackend):
+    def __init__(self, complete=None):
+        self.complete = complete or self.default_complete
+
+    @abstractmethod
+    def default_complete(self, prompt: str):
+        ...
+
+    @abstractmethod
+    def parse_output(self, model_output: str):
+        ...
+
+    def parse(self, prompt: str):
+        return self.parse_with_output(prompt)[0]
+
+    def parse_with_output(self, prompt: str):
+        model_output = self.complete(prompt)
+        try:
+            return self.parse_output(model_output), model_output
+        except ValueError as e:
+            raise ModelOutputError(str(e), model_output) from e
+
+
+class LocalModelParser(ModelParser):
+    name = "local"
+
+    def default_complete(self, prompt: str):
+        return generate_local(prompt)
+
+    def parse_output(self, model_output: str):
+        spec = DesignSpec(*extract_parameters(model_output))
+        if spec.helices is None or spec.length is None:
+            raise ValueError("Failed to extract necessary parameters.")
+        return spec
+
+
+class RemoteModelParser(ModelParser):
+    name = "online"
+
+    def default_complete(self, prompt: str):
+        return query_remote_model(prompt)
+
+    def parse_output(self, model_output: str):
+        return DesignSpec(*parse_structured_data(model_output))
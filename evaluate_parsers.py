@@ -0,0 +1,225 @@
+import json
+import math
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Accuracy and speed of the prompt parsers against ground-truth specs.
+#
+# Corpus entries are {"prompt": ..., "spec": {...}} lines, as written by simulate_human_input.py;
+# prompts_examples_labels.jsonl labels the prompts of prompts_examples.txt. A spec field that is
+# null is not labeled (the prompt is ambiguous about it) and is left out of the scores.
+#
+# Scores are micro-averaged over the corpus: helices and length count as one item each, the
+# instruction lists as multisets, with crossovers compared as helix pairs since no parser
+# returns positions.
+
+LABELED_CORPUS = 'prompts_examples_labels.jsonl'
+BACKENDS = ("regex", "local", "online")
+FIELDS = ("helices", "length", "loops", "sticky_ends", "crossovers")
+
+
+def load_corpus(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def generated_corpus(count, seed=0):
+    from simulate_human_input import iter_prompt_specs
+    return [{"prompt": prompt, "spec": spec} for prompt, spec in iter_prompt_specs(count, seed=seed)]
+
+
+# Recorded model responses, so the model backends can run offline.
+# One JSONL line per response: {"backend": ..., "prompt": ..., "response": ..., "latency": ...}
+# where latency is the seconds the original parse took, model call included.
+def load_responses(path, backend):
+    responses = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                if entry["backend"] == backend:
+                    responses[entry["prompt"]] = entry
+    return responses
+
+
+# A prompt missing from the recording: the recording doesn't match the corpus, so the run stops
+class MissingResponseError(LookupError):
+    pass
+
+
+def _replay(responses):
+    def complete(prompt):
+        if prompt not in responses:
+            raise MissingResponseError(f"No recorded response for prompt: {prompt[:80]!r}")
+        return responses[prompt]["response"]
+    return complete
+
+
+# `responses`: recorded responses to replay instead of calling the model
+def make_backend(name, responses=None):
+    from dna_parsers import RegexParser, LocalModelParser, RemoteModelParser
+
+    if name == "regex":
+        return RegexParser()
+    backend_class = {"local": LocalModelParser, "online": RemoteModelParser}[name]
+    if responses is not None:
+        return backend_class(complete=_replay(responses))
+    return backend_class()
+
+
+# Field value -> multiset of comparable items (None: not labeled / not predicted)
+def _items(field, value):
+    if value is None:
+        return None
+    if field in ("helices", "length"):
+        return Counter([value])
+    if field == "crossovers":
+        return Counter(tuple(item[:2]) for item in value)
+    return Counter(tuple(item) for item in value)
+
+
+def score_prediction(spec, prediction, counts):
+    for field in FIELDS:
+        truth = _items(field, spec.get(field))
+        if truth is None:
+            continue
+        predicted = _items(field, getattr(prediction, field)) if prediction is not None else None
+        predicted = predicted or Counter()
+        true_positives = sum((truth & predicted).values())
+        counts[field]["tp"] += true_positives
+        counts[field]["fp"] += sum(predicted.values()) - true_positives
+        counts[field]["fn"] += sum(truth.values()) - true_positives
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    # Nearest rank: the smallest value with at least q% of the values at or below it
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _latency_ms(sorted_latencies):
+    return {f"p{q}": percentile(sorted_latencies, q) * 1000 for q in (50, 95, 99)} if sorted_latencies else {}
+
+
+# Run one backend over the corpus (in its own process, so backends don't share a GIL)
+def evaluate_backend(name, corpus, responses_path=None, record=False):
+    replayed = bool(responses_path) and name != "regex"
+    responses = load_responses(responses_path, name) if replayed else None
+    backend = make_backend(name, responses)
+    counts = {field: {"tp": 0, "fp": 0, "fn": 0} for field in FIELDS}
+    latencies = []
+    recorded_latencies = []
+    failures = 0  # the backend could not parse the prompt (ValueError)
+    errors = 0    # the model call itself went wrong (ModelCallError, ...); left out of the scores
+    recorded = []
+
+    started = time.perf_counter()
+    for entry in corpus:
+        t0 = time.perf_counter()
+        try:
+            prediction, model_output = backend.parse_with_output(entry["prompt"])
+        except ValueError as e:
+            prediction, model_output = None, getattr(e, "model_output", None)
+            failures += 1
+        except (ImportError, MissingResponseError):
+            raise  # the run itself is misconfigured: stop rather than score it
+        except Exception:
+            errors += 1
+            continue
+        latency = time.perf_counter() - t0
+        latencies.append(latency)
+        score_prediction(entry["spec"], prediction, counts)
+        if replayed and responses[entry["prompt"]].get("latency") is not None:
+            recorded_latencies.append(responses[entry["prompt"]]["latency"])
+        if record and model_output is not None:
+            recorded.append({"backend": name, "prompt": entry["prompt"], "response": model_output,
+                             "latency": latency})
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    recorded_latencies.sort()
+    fields = {}
+    for field, c in counts.items():
+        predicted, labeled = c["tp"] + c["fp"], c["tp"] + c["fn"]
+        fields[field] = {
+            "precision": c["tp"] / predicted if predicted else None,
+            "recall": c["tp"] / labeled if labeled else None,
+            **c,
+        }
+    report = {
+        "backend": name,
+        "replayed": replayed,
+        "prompts": len(corpus),
+        "failures": failures,
+        "errors": errors,
+        "prompts_per_sec": len(corpus) / elapsed if elapsed else None,
+        "latency_ms": _latency_ms(latencies),
+        # Replayed runs: speed of the original calls, as recorded with --record
+        "recorded_prompts_per_sec": len(recorded_latencies) / sum(recorded_latencies) if sum(recorded_latencies) else None,
+        "recorded_latency_ms": _latency_ms(recorded_latencies),
+        "fields": fields,
+    }
+    return report, recorded
+
+
+def evaluate(corpus, backends=BACKENDS, responses_path=None, record=False):
+    with ProcessPoolExecutor(max_workers=len(backends)) as pool:
+        futures = [pool.submit(evaluate_backend, name, corpus, responses_path, record) for name in backends]
+        return [future.result() for future in futures]
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else "-"
+
+
+def print_report(reports):
+    for report in reports:
+        replayed = " (recorded responses)" if report["replayed"] else ""
+        latency = report["latency_ms"]
+        print(f"\n== {report['backend']}{replayed}: {report['prompts']} prompts, {report['failures']} failed to parse, "
+              f"{report['errors']} errors")
+        print(f"   {_fmt(report['prompts_per_sec'], '.1f')} prompts/sec, latency p50 {_fmt(latency.get('p50'), '.3f')} ms, "
+              f"p95 {_fmt(latency.get('p95'), '.3f')} ms, p99 {_fmt(latency.get('p99'), '.3f')} ms")
+        if report["recorded_latency_ms"]:
+            latency = report["recorded_latency_ms"]
+            print(f"   recorded: {_fmt(report['recorded_prompts_per_sec'], '.1f')} prompts/sec, "
+                  f"latency p50 {_fmt(latency.get('p50'), '.3f')} ms, p95 {_fmt(latency.get('p95'), '.3f')} ms, "
+                  f"p99 {_fmt(latency.get('p99'), '.3f')} ms")
+        print(f"   {'field':<12} {'precision':>9} {'recall':>7}")
+        for field, scores in report["fields"].items():
+            print(f"   {field:<12} {_fmt(scores['precision'], '.3f'):>9} {_fmt(scores['recall'], '.3f'):>7}")
+
+
+# MAIN
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate parser backends against ground-truth specs.")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--corpus", nargs="*", default=[LABELED_CORPUS], help="labeled prompt/spec JSONL files")
+    parser.add_argument("--generated", type=int, default=1000, help="number of generated prompts to add")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--responses", default=None, help="recorded model responses to replay (offline run)")
+    parser.add_argument("--record", default=None, help="call the models and save their responses here")
+    parser.add_argument("--json", default=None, help="also write the reports to this file")
+    args = parser.parse_args()
+
+    corpus = [entry for path in args.corpus for entry in load_corpus(path)]
+    if args.generated:
+        corpus += generated_corpus(args.generated, args.seed)
+
+    results = evaluate(corpus, args.backends, args.responses, record=bool(args.record))
+    reports = [report for report, _ in results]
+    print_report(reports)
+
+    if args.record:
+        with open(args.record, "w") as f:
+            for _, recorded in results:
+                for entry in recorded:
+                    f.write(json.dumps(entry) + "\n")
+        print(f"\nModel responses saved to {args.record}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
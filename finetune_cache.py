@@ -0,0 +1,225 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import argparse
+
+# Tokenized fine-tuning data, built once per (dataset, tokenizer) and memory-mapped afterwards.
+#
+# <cache_root>/<dataset hash>_<tokenizer>_<max length>_<bucket width>/
+#   input_ids.bin   prompt token ids of every example, packed back to back
+#   labels.bin      output token ids, packed the same way
+#   index.npy       per example: input offset, input length, target offset, target length, bucket
+#   meta.json       tokenizer, dtype, bucket width, example count
+#
+# Examples are stored sorted by length bucket, so a batch drawn from one bucket is a contiguous
+# slice of the mapped files and needs little padding.
+
+CACHE_ROOT = '.token_cache'
+DEFAULT_TOKENIZER = 'google/flan-t5-small'
+DEFAULT_MAX_LENGTH = 512
+DEFAULT_BUCKET_WIDTH = 16
+
+# index.npy columns
+INPUT_OFFSET, INPUT_LENGTH, TARGET_OFFSET, TARGET_LENGTH, BUCKET = range(5)
+
+
+def dataset_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+# Everything that changes the cached arrays is in the name, so a cache is never stale for its settings
+def cache_dir_for(dataset_path, tokenizer_name, cache_root=CACHE_ROOT,
+                  max_length=DEFAULT_MAX_LENGTH, bucket_width=DEFAULT_BUCKET_WIDTH):
+    return os.path.join(cache_root, f"{dataset_hash(dataset_path)}_{tokenizer_name.replace('/', '__')}"
+                                    f"_{max_length}_{bucket_width}")
+
+
+def _iter_jsonl_batches(path, batch_size):
+    prompts, outputs = [], []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            prompts.append(entry["prompt"])
+            outputs.append(entry["output"])
+            if len(prompts) == batch_size:
+                yield prompts, outputs
+                prompts, outputs = [], []
+    if prompts:
+        yield prompts, outputs
+
+
+def build_token_cache(dataset_path, tokenizer_name=DEFAULT_TOKENIZER, cache_root=CACHE_ROOT, tokenizer=None,
+                      batch_size=1024, max_length=DEFAULT_MAX_LENGTH, bucket_width=DEFAULT_BUCKET_WIDTH):
+    if tokenizer is None:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+    cache_dir = cache_dir_for(dataset_path, tokenizer_name, cache_root, max_length, bucket_width)
+    # A private build directory next to the cache, so concurrent builds never share files
+    os.makedirs(cache_root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_root, prefix=os.path.basename(cache_dir) + '.')
+    try:
+        _write_token_cache(dataset_path, tokenizer_name, tokenizer, tmp_dir, batch_size, max_length, bucket_width)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Publish with a single rename, so readers never see a half-written cache. The name fixes the
+    # contents, so if another process published first its cache is as good as ours: keep it.
+    try:
+        os.rename(tmp_dir, cache_dir)
+    except OSError:
+        if not os.path.isdir(cache_dir):
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return cache_dir
+
+
+# Tokenize the dataset into `tmp_dir`: the .bin files, index.npy and meta.json
+def _write_token_cache(dataset_path, tokenizer_name, tokenizer, tmp_dir, batch_size, max_length, bucket_width):
+    import numpy as np
+
+    dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.int32
+
+    # Pass 1: tokenize in batches and append to unsorted files
+    input_lengths, target_lengths = [], []
+    with open(os.path.join(tmp_dir, 'input_ids.unsorted'), 'wb') as inputs_file, \
+            open(os.path.join(tmp_dir, 'labels.unsorted'), 'wb') as labels_file:
+        for prompts, outputs in _iter_jsonl_batches(dataset_path, batch_size):
+            input_ids = tokenizer(prompts, truncation=True, max_length=max_length)["input_ids"]
+            labels = tokenizer(outputs, truncation=True, max_length=max_length)["input_ids"]
+            for ids, out_file, lengths in ((input_ids, inputs_file, input_lengths), (labels, labels_file, target_lengths)):
+                np.fromiter((token for seq in ids for token in seq), dtype=dtype).tofile(out_file)
+                lengths.extend(len(seq) for seq in ids)
+
+    input_lengths = np.asarray(input_lengths, dtype=np.int64)
+    target_lengths = np.asarray(target_lengths, dtype=np.int64)
+    input_offsets = np.concatenate(([0], np.cumsum(input_lengths)[:-1])) if len(input_lengths) else input_lengths
+    target_offsets = np.concatenate(([0], np.cumsum(target_lengths)[:-1])) if len(target_lengths) else target_lengths
+    buckets = np.maximum(input_lengths, target_lengths) // bucket_width
+
+    # Pass 2: rewrite the examples grouped by bucket (stable, so order within a bucket is kept)
+    order = np.argsort(buckets, kind='stable')
+    index = np.empty((len(order), 5), dtype=np.int64)
+    for name, offsets, lengths, offset_col, length_col in (
+            ('input_ids', input_offsets, input_lengths, INPUT_OFFSET, INPUT_LENGTH),
+            ('labels', target_offsets, target_lengths, TARGET_OFFSET, TARGET_LENGTH)):
+        unsorted_path = os.path.join(tmp_dir, f'{name}.unsorted')
+        source = np.memmap(unsorted_path, dtype=dtype, mode='r') if lengths.sum() else np.empty(0, dtype=dtype)
+        index[:, length_col] = lengths[order]
+        index[:, offset_col] = np.concatenate(([0], np.cumsum(index[:-1, length_col]))) if len(order) else 0
+        with open(os.path.join(tmp_dir, f'{name}.bin'), 'wb') as out_file:
+            for chunk_start in range(0, len(order), batch_size):
+                chunk = order[chunk_start:chunk_start + batch_size]
+                pieces = [source[offsets[example]:offsets[example] + lengths[example]] for example in chunk]
+                np.concatenate(pieces).astype(dtype, copy=False).tofile(out_file)
+        del source
+        os.remove(unsorted_path)
+    index[:, BUCKET] = buckets[order]
+    np.save(os.path.join(tmp_dir, 'index.npy'), index)
+
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump({
+            "dataset": os.path.abspath(dataset_path),
+            "tokenizer": tokenizer_name,
+            "dtype": np.dtype(dtype).name,
+            "num_examples": int(len(order)),
+            "max_length": max_length,
+            "bucket_width": bucket_width,
+            "pad_token_id": getattr(tokenizer, 'pad_token_id', None),
+        }, f, indent=2)
+
+
+# Read-only view over a token cache: examples are zero-copy slices of the mapped files
+class TokenizedDataset:
+    def __init__(self, cache_dir):
+        import numpy as np
+
+        with open(os.path.join(cache_dir, 'meta.json')) as f:
+            self.meta = json.load(f)
+        dtype = np.dtype(self.meta["dtype"])
+        self.index = np.load(os.path.join(cache_dir, 'index.npy'), mmap_mode='r')
+        self.input_ids = self._map(os.path.join(cache_dir, 'input_ids.bin'), dtype)
+        self.labels = self._map(os.path.join(cache_dir, 'labels.bin'), dtype)
+
+    @staticmethod
+    def _map(path, dtype):
+        import numpy as np
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)  # np.memmap can't map an empty file
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        input_offset, input_length, target_offset, target_length, _ = self.index[i]
+        return (self.input_ids[input_offset:input_offset + input_length],
+                self.labels[target_offset:target_offset + target_length])
+
+    # Lists of example indices, each list from a single length bucket
+    def bucket_batches(self, batch_size, shuffle=False, seed=None):
+        import numpy as np
+
+        buckets = self.index[:, BUCKET]
+        # Examples are sorted by bucket, so each bucket is one contiguous run of rows
+        starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+        ends = np.append(starts[1:], len(buckets))
+        batches = [list(range(batch_start, min(batch_start + batch_size, end)))
+                   for start, end in zip(starts, ends)
+                   for batch_start in range(start, end, batch_size)]
+        if shuffle:
+            np.random.default_rng(seed).shuffle(batches)
+        return batches
+
+    # Pad a batch into (input_ids, attention_mask, labels) arrays; label padding is -100 so the loss ignores it
+    def collate(self, indices, pad_token_id=None):
+        import numpy as np
+
+        if pad_token_id is None:
+            pad_token_id = self.meta.get("pad_token_id") or 0
+        examples = [self[i] for i in indices]
+        input_width = max((len(inputs) for inputs, _ in examples), default=0)
+        label_width = max((len(labels) for _, labels in examples), default=0)
+        input_ids = np.full((len(examples), input_width), pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(examples), input_width), dtype=np.int64)
+        labels = np.full((len(examples), label_width), -100, dtype=np.int64)
+        for row, (inputs, targets) in enumerate(examples):
+            input_ids[row, :len(inputs)] = inputs
+            attention_mask[row, :len(inputs)] = 1
+            labels[row, :len(targets)] = targets
+        return input_ids, attention_mask, labels
+
+
+# Cached dataset for (dataset, tokenizer), tokenizing only if it isn't cached yet
+def get_tokenized_dataset(dataset_path, tokenizer_name=DEFAULT_TOKENIZER, cache_root=CACHE_ROOT,
+                          max_length=DEFAULT_MAX_LENGTH, bucket_width=DEFAULT_BUCKET_WIDTH, **build_kwargs):
+    cache_dir = cache_dir_for(dataset_path, tokenizer_name, cache_root, max_length, bucket_width)
+    if not os.path.exists(os.path.join(cache_dir, 'meta.json')):
+        print(f"Tokenizing {dataset_path} with {tokenizer_name}...")
+        cache_dir = build_token_cache(dataset_path, tokenizer_name, cache_root, max_length=max_length,
+                                      bucket_width=bucket_width, **build_kwargs)
+    return TokenizedDataset(cache_dir)
+
+
+# MAIN
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tokenize a fine-tuning JSONL once and cache it.")
+    parser.add_argument("dataset", nargs="?", default="scadnano_finetune_dataset.jsonl")
+    parser.add_argument("--tokenizer", default=DEFAULT_TOKENIZER)
+    parser.add_argument("--cache-root", default=CACHE_ROOT)
+    parser.add_argument("--max-length", type=int, default=DEFAULT_MAX_LENGTH)
+    parser.add_argument("--bucket-width", type=int, default=DEFAULT_BUCKET_WIDTH)
+    args = parser.parse_args()
+
+    dataset = get_tokenized_dataset(args.dataset, args.tokenizer, args.cache_root,
+                                    max_length=args.max_length, bucket_width=args.bucket_width)
+    print(f"✅ {len(dataset)} tokenized examples cached for {args.tokenizer}")
@@ -0,0 +1,143 @@
+import re
+import json
+import mmap
+import codecs
+
+# Lightweight reader for scadnano .sc files.
+# The file is memory-mapped, the "helices" and "strands" arrays are located without copying it, and
+# each strand object is decoded on its own and reduced to the requested fields, so no sc.Design (and
+# none of its helix, strand and domain objects) is ever built. Anything unexpected falls back to
+# the full scadnano loader.
+
+_HELICES_KEY = re.compile(rb'"helices"\s*:\s*\[')
+_STRANDS_KEY = re.compile(rb'"strands"\s*:\s*\[')
+_SEPARATORS = re.compile(r'[\s,]*')
+
+# Bytes of the mapped file decoded at a time
+WINDOW_SIZE = 1 << 20
+
+
+# Per-strand features, computed from the strand's domains. `domains` holds only the helix domains;
+# strand["domains"] also has loopouts and 5'/3' extensions.
+def _helix_index(strand, domains):
+    return domains[0]["helix"] if domains else None
+
+def _strand_name(strand, domains):
+    return strand.get("name")
+
+def _strand_length(strand, domains):
+    return sum(domain["end"] - domain["start"] for domain in domains)
+
+def _direction(strand, domains):
+    if not domains:
+        return None
+    return 'forward' if domains[0]["forward"] else 'reverse'
+
+def _domain_count(strand, domains):
+    return len(domains)
+
+def _loopout_count(strand, domains):
+    return sum(1 for domain in strand["domains"] if "loopout" in domain)
+
+# Only two helix domains directly next to each other are joined by a crossover (not through a loopout)
+def _crossover_count(strand, domains):
+    every = strand["domains"]
+    return sum(1 for a, b in zip(every, every[1:]) if "helix" in a and "helix" in b and a["helix"] != b["helix"])
+
+STRAND_FIELDS = {
+    "helix_index": _helix_index,
+    "strand_name": _strand_name,
+    "strand_length": _strand_length,
+    "direction": _direction,
+    "domain_count": _domain_count,
+    "loopout_count": _loopout_count,
+    "crossover_count": _crossover_count,
+}
+
+
+# Yield the items of the JSON array opened at byte `pos`, one at a time.
+# The mapped bytes are decoded a window at a time and each item goes through the C JSON decoder,
+# so memory stays at one window plus one item however large the file is.
+def _iter_array_items(mm, pos):
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    idx = 0
+    end_of_file = False
+
+    while True:
+        idx = _SEPARATORS.match(buf, idx).end()
+        if idx < len(buf) and buf[idx] == ']':
+            return
+        try:
+            if idx >= len(buf):
+                raise json.JSONDecodeError("Need more data", buf, idx)
+            item, idx = decoder.raw_decode(buf, idx)
+        except json.JSONDecodeError:
+            if end_of_file:
+                raise
+            # Item runs past the window: drop what we've consumed and decode the next window
+            chunk = mm[pos:pos + WINDOW_SIZE]
+            pos += len(chunk)
+            end_of_file = pos >= len(mm)
+            buf = buf[idx:] + utf8.decode(chunk, final=end_of_file)
+            idx = 0
+            continue
+        yield item
+
+
+def _find_array(mm, key):
+    match = key.search(mm)
+    if match is None:
+        raise ValueError(f"No {key.pattern.decode()} array found")
+    return match.end()
+
+
+def _open_mmap(path):
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def count_helices(path):
+    with _open_mmap(path) as mm:
+        return sum(1 for _ in _iter_array_items(mm, _find_array(mm, _HELICES_KEY)))
+
+
+# Stream the requested features of every strand in the file, one dict per strand
+def iter_strand_features(path, fields=None):
+    getters = [(name, STRAND_FIELDS[name]) for name in (fields or STRAND_FIELDS)]
+    with _open_mmap(path) as mm:
+        for strand in _iter_array_items(mm, _find_array(mm, _STRANDS_KEY)):
+            domains = [domain for domain in strand["domains"] if "helix" in domain]
+            yield {name: getter(strand, domains) for name, getter in getters}
+
+
+# Same features from a fully loaded sc.Design
+def features_from_design(design, fields=None):
+    import scadnano as sc
+
+    names = list(fields or STRAND_FIELDS)
+    for strand in design.strands:
+        domains = [domain for domain in strand.domains if isinstance(domain, sc.Domain)]
+        helices = [domain.helix for domain in domains]
+        features = {
+            "helix_index": helices[0] if helices else None,
+            "strand_name": strand.name if hasattr(strand, 'name') else None,
+            "strand_length": sum(domain.end - domain.start for domain in domains),
+            "direction": ('forward' if domains[0].forward else 'reverse') if domains else None,
+            "domain_count": len(domains),
+            "loopout_count": sum(1 for domain in strand.domains if isinstance(domain, sc.Loopout)),
+            "crossover_count": sum(1 for a, b in zip(strand.domains, strand.domains[1:])
+                                   if isinstance(a, sc.Domain) and isinstance(b, sc.Domain) and a.helix != b.helix),
+        }
+        yield {name: features[name] for name in names}
+
+
+# Helix count and strand features of one design: the lightweight reader if it can, the full loader if not
+def load_design_features(path, fields=None):
+    try:
+        return count_helices(path), list(iter_strand_features(path, fields))
+    except (ValueError, KeyError, TypeError, IndexError):
+        import scadnano as sc
+        design = sc.Design.from_scadnano_file(path)
+        return len(design.helices), list(features_from_design(design, fields))
@@ -1,4 +1,7 @@
+import json
 import random
+import argparse
+import itertools
 
 def generate_human_like_dna_design_prompt():
     num_helices = random.choice([4, 5, 6])
@@ -35,5 +38,178 @@ def generate_human_like_dna_design_prompt():
     full_prompt = " ".join(prompt_parts)
     return full_prompt
 
-# Example use:
-print(generate_human_like_dna_design_prompt())
+
+# --- Bulk generation for load tests and parser benchmarks ---
+
+# Scenario strata: inclusive (low, high) ranges per dimension.
+# "features" is the total number of crossovers + sticky ends + loops in a design.
+DEFAULT_STRATA = {
+    "helices": [(2, 6), (7, 16), (17, 64), (65, 256)],
+    "length": [(32, 128), (129, 512), (513, 2048), (2049, 8192)],
+    "features": [(0, 3), (4, 16), (17, 64), (65, 256)],
+}
+
+# How a design's features are split between crossovers, sticky ends and loops
+DEFAULT_FEATURE_MIX = {"crossovers": 0.6, "sticky_ends": 0.25, "loops": 0.15}
+
+MIN_HELIX_LENGTH_FOR_CROSSOVER = 8
+
+
+# --- Phrasings: several per instruction so parsers see some variety ---
+OPENINGS = [
+    "Hi, I'd like to design a 2D DNA origami structure.",
+    "Please generate a DNA origami sheet.",
+    "I need to create a multi-helix DNA scaffold.",
+    "Can you help me design a lattice of DNA helices?",
+]
+SIZE_PHRASES = [
+    "Let's use {helices} helices, each exactly {length} bases long.",
+    "Use {helices} helices with {length} bp each.",
+    "It should have {helices} helices, each {length} base pairs long.",
+]
+CROSSOVER_PHRASES = [
+    "between helices {h1}-{h2} around base {pos}",
+    "between helix {h1} and helix {h2} at base {pos}",
+]
+STICKY_END_PHRASES = [
+    "Also, please add a sticky end from helix {h1} to helix {h2}.",
+    "Helix {h1} has a sticky end linking with helix {h2}.",
+    "Helix {h1} should have a sticky end that connects to helix {h2}.",
+]
+LOOP_PHRASES = [
+    "Helix {h1} and {h2} have a loop of {loop_length} base pairs.",
+    "Add a loop of {loop_length} bases between helix {h1} and helix {h2}.",
+]
+CLOSINGS = [
+    "Can you set it up cleanly in scadnano?",
+    "Thanks!",
+    "",
+]
+
+
+# Ground-truth spec -> prompt text
+def render_prompt(spec, rng=random):
+    prompt_parts = [rng.choice(OPENINGS)]
+    prompt_parts.append(rng.choice(SIZE_PHRASES).format(helices=spec["helices"], length=spec["length"]))
+
+    if spec["crossovers"]:
+        cross_txt = ", ".join(rng.choice(CROSSOVER_PHRASES).format(h1=h1, h2=h2, pos=pos)
+                              for (h1, h2, pos) in spec["crossovers"])
+        prompt_parts.append(f"I'd like to have crossovers {cross_txt}.")
+
+    for (h1, h2) in spec["sticky_ends"]:
+        prompt_parts.append(rng.choice(STICKY_END_PHRASES).format(h1=h1, h2=h2))
+
+    for (h1, h2, loop_length) in spec["loops"]:
+        prompt_parts.append(rng.choice(LOOP_PHRASES).format(h1=h1, h2=h2, loop_length=loop_length))
+
+    prompt_parts.append(rng.choice(CLOSINGS))
+    return " ".join(part for part in prompt_parts if part)
+
+
+def _split_features(rng, num_features, feature_mix):
+    kinds = list(feature_mix)
+    counts = dict.fromkeys(kinds, 0)
+    for kind in rng.choices(kinds, weights=[feature_mix[kind] for kind in kinds], k=num_features):
+        counts[kind] += 1
+    return counts
+
+
+# A random design spec with the given size and feature count (helices are 1-based, like in the prompts)
+def sample_spec(rng, helices, length, num_features, feature_mix=DEFAULT_FEATURE_MIX):
+    counts = _split_features(rng, num_features, feature_mix)
+    if helices < 2:
+        # Every feature joins two helices, so a single helix gets none
+        counts = dict.fromkeys(counts, 0)
+    elif length < MIN_HELIX_LENGTH_FOR_CROSSOVER:
+        counts["sticky_ends"] += counts["crossovers"]
+        counts["crossovers"] = 0
+
+    # Crossovers between adjacent helices, away from the helix ends
+    margin = min(30, length // 4)
+    crossovers = []
+    for _ in range(counts["crossovers"]):
+        h1 = rng.randint(1, helices - 1)
+        crossovers.append((h1, h1 + 1, rng.randint(margin, length - margin)))
+    crossovers.sort()
+
+    sticky_ends = [tuple(rng.sample(range(1, helices + 1), 2)) for _ in range(counts["sticky_ends"])]
+    loops = [(*rng.sample(range(1, helices + 1), 2), rng.randint(3, 15)) for _ in range(counts["loops"])]
+
+    return {
+        "helices": helices,
+        "length": length,
+        "crossovers": crossovers,
+        "sticky_ends": sticky_ends,
+        "loops": loops,
+    }
+
+
+# Order in which the strata are visited.
+# Without weights every (helices, length, features) combination comes up equally often, in
+# shuffled rounds, so even a short run reaches the large-design tail; with weights each
+# dimension's bucket is drawn independently with those weights.
+def _iter_strata(rng, strata, weights):
+    dimensions = ("helices", "length", "features")
+    if weights:
+        while True:
+            yield tuple(rng.choices(strata[dim], weights=weights.get(dim) or [1] * len(strata[dim]))[0]
+                        for dim in dimensions)
+    combinations = list(itertools.product(*(strata[dim] for dim in dimensions)))
+    while True:
+        rng.shuffle(combinations)
+        yield from combinations
+
+
+# Stream (prompt, spec) pairs; count=None streams forever.
+# `strata` may give only some dimensions, the others keep their DEFAULT_STRATA buckets;
+# `weights` gives one weight per bucket of a dimension.
+def iter_prompt_specs(count=None, strata=None, weights=None, feature_mix=DEFAULT_FEATURE_MIX, seed=None):
+    rng = random.Random(seed)
+    strata = {**DEFAULT_STRATA, **(strata or {})}
+    for dim, dim_weights in (weights or {}).items():
+        if dim not in strata:
+            raise ValueError(f"Weights given for unknown dimension {dim!r} (expected one of {sorted(strata)})")
+        if dim_weights and len(dim_weights) != len(strata[dim]):
+            raise ValueError(f"{len(dim_weights)} weights given for {dim!r}, but it has {len(strata[dim])} strata buckets")
+    chosen = _iter_strata(rng, strata, weights)
+    if count is not None:
+        chosen = itertools.islice(chosen, count)
+    for helix_range, length_range, feature_range in chosen:
+        spec = sample_spec(rng, rng.randint(*helix_range), rng.randint(*length_range),
+                           rng.randint(*feature_range), feature_mix)
+        yield render_prompt(spec, rng), spec
+
+
+# MAIN
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate human-like DNA design prompts.")
+    parser.add_argument("--count", type=int, default=None, help="number of prompt/spec pairs to write as JSONL")
+    parser.add_argument("--out", default=None, help="output JSONL (default: stdout)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--strata", type=json.loads, default=None,
+                        help='JSON buckets per dimension, e.g. \'{"helices": [[2, 6], [7, 16]]}\'; '
+                             'dimensions left out keep the defaults')
+    parser.add_argument("--weights", type=json.loads, default=None,
+                        help='JSON weight per bucket, e.g. \'{"helices": [3, 1]}\' (default: even coverage)')
+    parser.add_argument("--feature-mix", type=json.loads, default=DEFAULT_FEATURE_MIX,
+                        help='JSON share of crossovers, sticky ends and loops, e.g. '
+                             '\'{"crossovers": 0.5, "sticky_ends": 0.3, "loops": 0.2}\'')
+    args = parser.parse_args()
+
+    if args.count is None:
+        # Example use:
+        print(generate_human_like_dna_design_prompt())
+    else:
+        out = open(args.out, "w") if args.out else None
+        try:
+            for prompt, spec in iter_prompt_specs(args.count, strata=args.strata, weights=args.weights,
+                                                  feature_mix=args.feature_mix, seed=args.seed):
+                line = json.dumps({"prompt": prompt, "spec": spec})
+                if out:
+                    out.write(line + "\n")
+                else:
+                    print(line)
+        finally:
+            if out:
+                out.close()
@@ -1,7 +1,6 @@
 import json
 import random
 import string
-from tqdm import tqdm
 
 # --- CONFIGURATION ---
 NUM_EXAMPLES = 10000  # total examples
@@ -70,28 +69,36 @@ def messify_prompt(prompt):
     return " ".join(new_words)
 
 # --- MAIN dataset creation ---
-dataset = []
+def build_finetune_dataset(num_examples=NUM_EXAMPLES, path="scadnano_finetune_dataset.jsonl"):
+    from tqdm import tqdm
 
-for _ in tqdm(range(NUM_EXAMPLES)):
-    clean_prompt, helices, length, structure = create_clean_prompt()
-    output = create_fake_output(helices, length, structure)
+    dataset = []
 
-    # Decide if we add noise
-    if random.random() < NOISE_PROB:
-        prompt = messify_prompt(clean_prompt)
-    else:
-        prompt = clean_prompt
+    for _ in tqdm(range(num_examples)):
+        clean_prompt, helices, length, structure = create_clean_prompt()
+        output = create_fake_output(helices, length, structure)
 
-    # Final dataset entry
-    entry = {
-        "prompt": prompt,
-        "output": output
-    }
-    dataset.append(entry)
+        # Decide if we add noise
+        if random.random() < NOISE_PROB:
+            prompt = messify_prompt(clean_prompt)
+        else:
+            prompt = clean_prompt
+
+        # Final dataset entry
+        entry = {
+            "prompt": prompt,
+            "output": output
+        }
+        dataset.append(entry)
+
+    # --- Save to JSONL file ---
+    with open(path, "w") as f:
+        for item in dataset:
+            f.write(json.dumps(item) + "\n")
+
+    print(f"✅ Dataset with {num_examples} examples saved to {path}")
+    print(f"Tokenize it once for training with: python finetune_cache.py {path}")
 
-# --- Save to JSONL file ---
-with open("scadnano_finetune_dataset.jsonl", "w") as f:
-    for item in dataset:
-        f.write(json.dumps(item) + "\n")
 
-print(f"✅ Dataset with {NUM_EXAMPLES} examples saved to scadnano_finetune_dataset.jsonl")
+if __name__ == "__main__":
+    build_finetune_dataset()
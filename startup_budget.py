@@ -0,0 +1,61 @@
+import sys
+import json
+import subprocess
+
+# Modules that make up the parsing layer: importing them must stay cheap
+PARSING_MODULES = [
+    "dna_parsers",
+    "design_engine",
+    "react_dna_agent_regex",
+    "react_dna_agent_LLMlocal",
+    "react_dna_agent_LLMonline",
+    "ReAct_dna_LLMlocal_improved",
+    "build_dataset",
+]
+
+# Heavy dependencies that may only be imported on first use
+HEAVY_MODULES = ["scadnano", "transformers", "torch", "requests"]
+
+# Cold-import budget per module, in seconds
+IMPORT_BUDGET = 0.25
+
+_PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+# Import `module` in a fresh interpreter and report the time taken and any heavy modules it pulled in
+def measure_import(module):
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_startup_budget(modules=PARSING_MODULES, budget=IMPORT_BUDGET):
+    failures = []
+    for module in modules:
+        report = measure_import(module)
+        status = "ok"
+        if report["heavy"]:
+            status = f"imports {', '.join(report['heavy'])} eagerly"
+        elif report["seconds"] > budget:
+            status = f"over budget ({budget:.2f}s)"
+        if status != "ok":
+            failures.append(module)
+        print(f"{module}: {report['seconds'] * 1000:.1f} ms {status}")
+    return failures
+
+
+# MAIN
+if __name__ == "__main__":
+    failures = check_startup_budget()
+    if failures:
+        print(f"\nStartup budget exceeded by: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll parsing modules within the startup budget.")
@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import hashlib
+import time
+import uuid
+import statistics
+import argparse
+import atexit
+import threading
+
+# Where traces go unless told otherwise (REACT_TRACE_DB overrides it)
+DEFAULT_DB_PATH = os.path.join('designs', 'react_traces.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS designs (
+    design_id TEXT PRIMARY KEY,
+    prompt_hash TEXT NOT NULL,
+    prompt TEXT,
+    agent TEXT,
+    helices INTEGER,
+    length INTEGER,
+    outcome TEXT,
+    output_path TEXT,
+    started_at REAL,
+    parse_seconds REAL,
+    build_seconds REAL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    design_id TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    stage TEXT,
+    outcome TEXT,
+    thought TEXT,
+    action TEXT,
+    observation TEXT,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_steps_design ON steps (design_id);
+CREATE INDEX IF NOT EXISTS idx_steps_prompt ON steps (prompt_hash);
+CREATE INDEX IF NOT EXISTS idx_steps_stage_outcome ON steps (stage, outcome);
+CREATE INDEX IF NOT EXISTS idx_designs_prompt ON designs (prompt_hash);
+CREATE INDEX IF NOT EXISTS idx_designs_outcome ON designs (outcome);
+CREATE INDEX IF NOT EXISTS idx_designs_helices ON designs (helices);
+"""
+
+
+# The database a store opens when given no path
+def resolve_db_path(path=None):
+    return path or os.environ.get('REACT_TRACE_DB', DEFAULT_DB_PATH)
+
+
+def prompt_hash(prompt: str):
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+
+
+# Append-only SQLite store for ReAct traces.
+# Steps are buffered in memory and written in one transaction every `batch_size` rows
+# (and on flush/close), so tracing stays off the hot path of a design.
+# One store can be shared by designs running on several threads: the connection is not tied
+# to the thread that opened it, and the buffers and the connection are guarded by one lock.
+class TraceStore:
+    def __init__(self, path=None, batch_size=256):
+        self.path = resolve_db_path(path)
+        self.batch_size = batch_size
+        self._pending_steps = []
+        self._pending_designs = []
+        self._active = {}  # design_id -> bookkeeping for designs still being built
+        self._lock = threading.RLock()
+        self._closed = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    # --- Writing ---
+    def start_design(self, prompt: str, agent=None):
+        design_id = uuid.uuid4().hex
+        info = {
+            "prompt_hash": prompt_hash(prompt),
+            "prompt": prompt,
+            "agent": agent,
+            "started_at": time.time(),
+            "t0": time.perf_counter(),
+            "seq": 0,
+        }
+        with self._lock:
+            self._active[design_id] = info
+        return design_id
+
+    def log_step(self, design_id, thought, action, observation, stage=None, outcome="ok"):
+        with self._lock:
+            info = self._active[design_id]
+            self._pending_steps.append(
+                (design_id, info["prompt_hash"], info["seq"], stage, outcome, thought, action, observation, time.time())
+            )
+            info["seq"] += 1
+            if len(self._pending_steps) >= self.batch_size:
+                self.flush()
+
+    def log_steps(self, design_id, steps):
+        # Steps as built by the agents' log_step helper
+        with self._lock:
+            for step in steps:
+                self.log_step(design_id, step["thought"], step["action"], step["observation"],
+                              stage=step.get("stage"), outcome=step.get("outcome", "ok"))
+
+    # parse_seconds / build_seconds are measured by the caller (parsing includes any model call,
+    # building is scadnano work only); without them the whole time since start_design counts as build
+    def finish_design(self, design_id, outcome, helices=None, length=None, output_path=None,
+                      parse_seconds=None, build_seconds=None):
+        with self._lock:
+            info = self._active.pop(design_id)
+            if build_seconds is None and parse_seconds is None:
+                build_seconds = time.perf_counter() - info["t0"]
+            self._pending_designs.append(
+                (design_id, info["prompt_hash"], info["prompt"], info["agent"], helices, length, outcome,
+                 output_path, info["started_at"], parse_seconds, build_seconds)
+            )
+            if len(self._pending_designs) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending_steps and not self._pending_designs:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO steps (design_id, prompt_hash, seq, stage, outcome, thought, action, observation, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._pending_steps,
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO designs (design_id, prompt_hash, prompt, agent, helices, length, outcome, "
+                    "output_path, started_at, parse_seconds, build_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._pending_designs,
+                )
+            self._pending_steps = []
+            self._pending_designs = []
+
+    # Safe to call from any thread, and more than once
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self.conn.close()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Queries ---
+    def failed_designs(self, stage=None):
+        # Designs with at least one failed step (optionally only in the given stage)
+        query = ("SELECT DISTINCT d.design_id, d.prompt, d.output_path FROM steps s "
+                 "JOIN designs d ON d.design_id = s.design_id WHERE s.outcome = 'failed'")
+        params = ()
+        if stage:
+            query += " AND s.stage = ?"
+            params = (stage,)
+        with self._lock:
+            self.flush()
+            return self.conn.execute(query, params).fetchall()
+
+    def median_build_time_by_helices(self):
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(
+                "SELECT helices, build_seconds FROM designs WHERE helices IS NOT NULL AND build_seconds IS NOT NULL"
+            ).fetchall()
+        times = {}
+        for helices, seconds in rows:
+            times.setdefault(helices, []).append(seconds)
+        return {helices: statistics.median(times[helices]) for helices in sorted(times)}
+
+    # design_id -> (prompt_hash, outcome) for the given designs that are in the store,
+    # for joining design files to their traces a batch at a time
+    def design_outcomes(self, design_ids):
+        design_ids = [design_id for design_id in set(design_ids) if design_id]
+        if not design_ids:
+            return {}
+        placeholders = ", ".join("?" * len(design_ids))
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(
+                f"SELECT design_id, prompt_hash, outcome FROM designs WHERE design_id IN ({placeholders})",
+                design_ids,
+            ).fetchall()
+        return {design_id: (p_hash, outcome) for design_id, p_hash, outcome in rows}
+
+    def steps_for_design(self, design_id):
+        with self._lock:
+            self.flush()
+            return self.conn.execute(
+                "SELECT seq, stage, outcome, thought, action, observation FROM steps WHERE design_id = ? ORDER BY seq",
+                (design_id,),
+            ).fetchall()
+
+
+# Shared store for the agents, opened on first use (by whichever thread gets there first)
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = TraceStore()
+            atexit.register(_default_store.close)
+        return _default_store
+
+
+# MAIN
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the ReAct trace store.")
+    parser.add_argument("--db", default=None, help="path to the trace database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    failures = sub.add_parser("failures", help="designs with a failed step")
+    failures.add_argument("--stage", default=None, help="e.g. crossover, sticky_end, loop")
+    sub.add_parser("build-times", help="median build time per helix count")
+    show = sub.add_parser("show", help="print the trace of one design")
+    show.add_argument("design_id")
+    args = parser.parse_args()
+
+    with TraceStore(args.db) as store:
+        if args.command == "failures":
+            for design_id, prompt, output_path in store.failed_designs(args.stage):
+                print(f"{design_id}\t{output_path}\t{prompt}")
+        elif args.command == "build-times":
+            for helices, seconds in store.median_build_time_by_helices().items():
+                print(f"{helices} helices: {seconds:.4f}s")
+        else:
+            for step in store.steps_for_design(args.design_id):
+                print(step)